@@ -70,8 +70,10 @@ class DatadogBackend:
         valid_event_query = self.client.Metric.query(start=start,
                                                      end=end,
                                                      query=query_valid)
-        LOGGER.debug(f"Result good: {pprint.pformat(good_event_query)}")
-        LOGGER.debug(f"Result valid: {pprint.pformat(valid_event_query)}")
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(f"Result good: {pprint.pformat(good_event_query)}")
+            LOGGER.debug(
+                f"Result valid: {pprint.pformat(valid_event_query)}")
         good_event_count = DatadogBackend.count(good_event_query)
         valid_event_count = DatadogBackend.count(valid_event_query)
         bad_event_count = valid_event_count - good_event_count
@@ -95,7 +97,8 @@ class DatadogBackend:
         query = measurement['query']
         query = self._fmt_query(query, window)
         response = self.client.Metric.query(start=start, end=end, query=query)
-        LOGGER.debug(f"Result valid: {pprint.pformat(response)}")
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(f"Result valid: {pprint.pformat(response)}")
         sli_value = DatadogBackend.count(response, average=True)
         return sli_value
 
@@ -113,14 +116,16 @@ class DatadogBackend:
         slo_id = slo_config['backend']['measurement']['slo_id']
         from_ts = timestamp - window
         slo_data = self.client.ServiceLevelObjective.get(id=slo_id)
-        LOGGER.debug(
-            f"SLO data: {slo_id} | Result: {pprint.pformat(slo_data)}")
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(
+                f"SLO data: {slo_id} | Result: {pprint.pformat(slo_data)}")
         try:
             data = self.client.ServiceLevelObjective.history(id=slo_id,
                                                              from_ts=from_ts,
                                                              to_ts=timestamp)
-            LOGGER.debug(
-                f"Timeseries data: {slo_id} | Result: {pprint.pformat(data)}")
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug(f"Timeseries data: {slo_id} | "
+                             f"Result: {pprint.pformat(data)}")
             good_event_count = data['data']['series']['numerator']['sum']
             valid_event_count = data['data']['series']['denominator']['sum']
             bad_event_count = valid_event_count - good_event_count
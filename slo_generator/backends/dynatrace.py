@@ -20,11 +20,22 @@ import logging
 import pprint
 import requests
 
+from requests.adapters import HTTPAdapter
 from retrying import retry
+from urllib3.util.retry import Retry
 from slo_generator.constants import NO_DATA
 
 LOGGER = logging.getLogger(__name__)
 
+# HTTP connection pool size for Dynatrace sessions.
+POOL_SIZE = 32
+
+# Transient HTTP errors retried at the connection level.
+RETRY_CODES = (429, 502, 503, 504)
+
+# Shared HTTP sessions, keyed by Dynatrace API URL.
+SESSIONS = {}
+
 
 class DynatraceBackend:
     """Backend for querying metrics from Datadog.
@@ -46,7 +57,8 @@ class DynatraceBackend:
         measurement = conf['measurement']
         slo_id = measurement['slo_id']
         data = self.retrieve_slo(start, end, slo_id)
-        LOGGER.debug(f"Result SLO: {pprint.pformat(data)}")
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(f"Result SLO: {pprint.pformat(data)}")
         sli_value = round(data['evaluatedPercentage']/100, 4)
         return sli_value
     
@@ -70,12 +82,16 @@ class DynatraceBackend:
 
         # Good query
         good_event_response = self.query(start=start, end=end, **query_good)
-        LOGGER.debug(f"Result good: {pprint.pformat(good_event_response)}")
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(
+                f"Result good: {pprint.pformat(good_event_response)}")
         good_event_count = DynatraceBackend.count(good_event_response)
 
         # Good query
         valid_event_response = self.query(start=start, end=end, **query_valid)
-        LOGGER.debug(f"Result valid: {pprint.pformat(valid_event_response)}")
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(
+                f"Result valid: {pprint.pformat(valid_event_response)}")
         valid_event_count = DynatraceBackend.count(valid_event_response)
 
         # Return good, bad
@@ -102,7 +118,8 @@ class DynatraceBackend:
         threshold = measurement['threshold']
         good_below_threshold = measurement.get('good_below_threshold', True)
         response = self.query(start=start, end=end, **query_valid)
-        LOGGER.debug(f"Result valid: {pprint.pformat(response)}")
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(f"Result valid: {pprint.pformat(response)}")
         return DynatraceBackend.count_threshold(response,
                                                 threshold,
                                                 good_below_threshold)
@@ -173,14 +190,9 @@ class DynatraceBackend:
         """
         try:
             datapoints = response['result'][0]['data']
-            values = []
-            for point in datapoints:
-                point_values = [
-                    point for point in point['values']
-                    if point is not None and point > 0
-                ]
-                values.extend(point_values)
-            return sum(values)
+            return sum(value for point in datapoints
+                       for value in point['values']
+                       if value is not None and value > 0)
         except (IndexError, KeyError) as exception:
             LOGGER.warning("Couldn't find any values in timeseries response")
             LOGGER.debug(exception)
@@ -201,22 +213,19 @@ class DynatraceBackend:
         """
         try:
             datapoints = response['result'][0]['data']
-            below = []
-            above = []
+            below = 0
+            above = 0
             for point in datapoints:
-                points_below = [
-                    point for point in point['values']
-                    if point is not None and point < threshold
-                ]
-                points_above = [
-                    point for point in point['values']
-                    if point is not None and point > threshold
-                ]
-                below.extend(points_below)
-                above.extend(points_above)
+                for value in point['values']:
+                    if value is None:
+                        continue
+                    if value < threshold:
+                        below += 1
+                    elif value > threshold:
+                        above += 1
             if good_below_threshold:
-                return len(below), len(above)
-            return len(above), len(below)
+                return below, above
+            return above, below
         except (IndexError, KeyError, ZeroDivisionError) as exception:
             LOGGER.warning("Couldn't find any values in timeseries response")
             LOGGER.debug(exception)
@@ -242,6 +251,34 @@ def retry_http(response):
     return code in retry_codes
 
 
+def get_session(api_url):
+    """Get a pooled HTTP session for a Dynatrace API URL.
+
+    Sessions are shared between clients targeting the same API URL so that
+    keep-alive connections are reused across queries and exports, including
+    when retrying transient HTTP errors.
+
+    Args:
+        api_url (str): Dynatrace API URL.
+
+    Returns:
+        requests.Session: HTTP session.
+    """
+    if api_url not in SESSIONS:
+        session = requests.Session()
+        retries = Retry(total=3,
+                        backoff_factor=0.2,
+                        status_forcelist=RETRY_CODES,
+                        raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE,
+                              pool_maxsize=POOL_SIZE,
+                              max_retries=retries)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        SESSIONS[api_url] = session
+    return SESSIONS[api_url]
+
+
 class DynatraceClient:
     """Small wrapper around requests to query Dynatrace API.
 
@@ -252,9 +289,16 @@ class DynatraceClient:
     # Keys to extract response data for each endpoint
     ENDPOINT_KEYS = {'metrics': 'metrics', 'metrics/query': 'result'}
 
+    # Headers sent with every request
+    HEADERS = {
+        'Accept': 'application/json',
+        'Content-Type': 'application/json',
+        'User-Agent': 'slo-generator'
+    }
+
     def __init__(self, api_url, api_key):
-        self.client = requests.Session()
         self.url = api_url.rstrip('/')
+        self.client = get_session(self.url)
         self.token = api_key
 
     @retry(retry_on_result=retry_http,
@@ -285,20 +329,14 @@ class DynatraceClient:
         req = getattr(self.client, method)
         url = f'{self.url}/api/{version}/{endpoint}'
         params['Api-Token'] = self.token
-        headers = {
-            'Accept': 'application/json',
-            'Content-Type': 'application/json',
-            'User-Agent': 'slo-generator'
-        }
+        headers = DynatraceClient.HEADERS
         if name:
             url += f'/{name}'
-        params_str = "&".join("%s=%s" % (k, v) for k, v in params.items()
-                              if v is not None)
-        url += f'?{params_str}'
+        # Let requests URL-encode params (and drop the ones set to None)
         if method in ['put', 'post']:
-            response = req(url, headers=headers, json=post_data)
+            response = req(url, headers=headers, params=params, json=post_data)
         else:
-            response = req(url, headers=headers)
+            response = req(url, headers=headers, params=params)
             LOGGER.debug(f'Response: {response}')
         data = DynatraceClient.to_json(response)
         next_page_key = data.get('nextPageKey')
@@ -153,7 +153,8 @@ class PrometheusBackend:
         LOGGER.debug(f'Query: {filter}')
         response = self.client.query(metric=filter)
         response = json.loads(response)
-        LOGGER.debug(pprint.pformat(response))
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(pprint.pformat(response))
         return response
 
     @staticmethod